@@ -6,6 +6,9 @@ Generate test videos with Morse code blinking light.
 import cv2
 import numpy as np
 import argparse
+import shutil
+import subprocess
+from itertools import chain, repeat
 
 
 # Morse code encoding
@@ -20,17 +23,20 @@ MORSE_ENCODE = {
 }
 
 
+# Translation table built once at import: each character maps straight to
+# its Morse string plus the separator, so str.translate can do the whole
+# per-character dispatch at C level
+_MORSE_TABLE = {ord(k): v + ' ' for k, v in MORSE_ENCODE.items()}
+_MORSE_TABLE[ord(' ')] = '/ '
+
+
 def text_to_morse(text):
     """Convert text to Morse code pattern."""
-    morse_list = []
-    
-    for char in text.upper():
-        if char == ' ':
-            morse_list.append('/')  # Word separator
-        elif char in MORSE_ENCODE:
-            morse_list.append(MORSE_ENCODE[char])
-    
-    return ' '.join(morse_list)
+    text = text.upper()
+    # translate passes unmapped characters straight through; drop them so
+    # punctuation can't leak into the pattern as bogus empty letters
+    text = ''.join(c for c in text if c == ' ' or c in MORSE_ENCODE)
+    return text.translate(_MORSE_TABLE).rstrip()
 
 
 def generate_timing_pattern(morse_code, unit_duration):
@@ -70,6 +76,17 @@ def generate_timing_pattern(morse_code, unit_duration):
     return pattern
 
 
+def iter_frame_states(pattern, fps):
+    """Stream one boolean per frame from (state, duration) segments.
+
+    chain.from_iterable + repeat expands the segments lazily, so no
+    per-frame list or array is ever materialized.
+    """
+    return chain.from_iterable(
+        repeat(state, int(duration * fps)) for state, duration in pattern
+    )
+
+
 def create_morse_video(text, output_path, wpm=12, fps=30, width=640, height=480):
     """Create a video with blinking Morse code."""
     
@@ -101,39 +118,115 @@ def create_morse_video(text, output_path, wpm=12, fps=30, width=640, height=480)
     
     print(f"  Total duration: {total_duration:.1f}s ({total_frames} frames)")
     
-    # Create video writer
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
-    
     # Light properties
     center = (width // 2, height // 2)
     radius = 50
-    
-    frame_count = 0
-    
-    for state, duration in pattern:
-        num_frames = int(duration * fps)
-        
-        for _ in range(num_frames):
-            # Create black frame
-            frame = np.zeros((height, width, 3), dtype=np.uint8)
-            
-            # Draw light if ON
-            if state:
-                cv2.circle(frame, center, radius, (255, 255, 255), -1)
-            
-            out.write(frame)
-            frame_count += 1
-    
-    # Add a final pause to ensure last symbol is decoded
+
+    # Pre-build the two frame templates once instead of zeroing and
+    # redrawing the circle for every single frame (the writers copy the
+    # buffer internally, so reusing them is safe)
+    off_frame = np.zeros((height, width, 3), dtype=np.uint8)
+    on_frame = off_frame.copy()
+    cv2.circle(on_frame, center, radius, (255, 255, 255), -1)
+
+    # Final pause to ensure the last symbol is decoded
     pause_frames = int(3 * unit_duration * fps)
-    black_frame = np.zeros((height, width, 3), dtype=np.uint8)
+
+    frame_count = None
+    if shutil.which('ffmpeg'):
+        frame_count = _write_frames_ffmpeg(output_path, pattern, pause_frames,
+                                           on_frame, off_frame, fps, width, height)
+        if frame_count is None:
+            print("Warning: ffmpeg failed, falling back to OpenCV writer")
+
+    if frame_count is None:
+        frame_count = _write_frames_opencv(output_path, pattern, pause_frames,
+                                           on_frame, off_frame, fps, width, height)
+
+    print(f"Video saved to {output_path} ({frame_count} frames)")
+
+
+def _write_frames_ffmpeg(output_path, pattern, pause_frames, on_frame, off_frame,
+                         fps, width, height):
+    """Pipe raw BGR frames to a single ffmpeg process.
+
+    Each run of identical frames is one stdin.write of the precomputed
+    bytes repeated, so hundreds of per-frame encoder calls collapse into
+    one OS write per pattern segment. Returns None if ffmpeg dies
+    mid-write (missing encoder, unwritable output, ...), so the caller
+    can fall back to the OpenCV writer.
+    """
+    cmd = ['ffmpeg', '-y', '-loglevel', 'error',
+           '-f', 'rawvideo', '-vcodec', 'rawvideo',
+           '-s', f'{width}x{height}', '-pix_fmt', 'bgr24', '-r', str(fps),
+           '-i', '-',
+           '-c:v', 'libx264', '-preset', 'ultrafast', '-tune', 'zerolatency',
+           '-pix_fmt', 'yuv420p',
+           output_path]
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+    # Repeated-template blocks are built once and reused, so a long gap
+    # streams as a few large writes instead of materializing one giant
+    # bytes object per segment
+    block_frames = 32
+    on_bytes = on_frame.tobytes()
+    off_bytes = off_frame.tobytes()
+    on_block = on_bytes * block_frames
+    off_block = off_bytes * block_frames
+
+    def write_run(single, block, num_frames):
+        while num_frames >= block_frames:
+            proc.stdin.write(block)
+            num_frames -= block_frames
+        if num_frames:
+            proc.stdin.write(single * num_frames)
+
+    # A present-but-broken ffmpeg closes the pipe mid-write; treat that
+    # as failure rather than crashing the generator
+    try:
+        frame_count = 0
+        for state, duration in pattern:
+            num_frames = int(duration * fps)
+            if num_frames:
+                write_run(on_bytes if state else off_bytes,
+                          on_block if state else off_block, num_frames)
+                frame_count += num_frames
+
+        if pause_frames:
+            write_run(off_bytes, off_block, pause_frames)
+            frame_count += pause_frames
+
+        proc.stdin.close()
+    except BrokenPipeError:
+        proc.wait()
+        return None
+
+    # ffmpeg can also consume every frame and still fail the encode -
+    # only a zero exit code means the file actually landed on disk
+    if proc.wait() != 0:
+        return None
+
+    return frame_count
+
+
+def _write_frames_opencv(output_path, pattern, pause_frames, on_frame, off_frame,
+                         fps, width, height):
+    """Fallback writer via cv2.VideoWriter when ffmpeg is not on PATH."""
+    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+    out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+
+    # Stream the per-frame states lazily - constant memory, no list build
+    frame_count = 0
+    for state in iter_frame_states(pattern, fps):
+        out.write(on_frame if state else off_frame)
+        frame_count += 1
+
     for _ in range(pause_frames):
-        out.write(black_frame)
+        out.write(off_frame)
         frame_count += 1
-    
+
     out.release()
-    print(f"Video saved to {output_path} ({frame_count} frames)")
+    return frame_count
 
 
 def main():
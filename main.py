@@ -6,7 +6,8 @@ Detects and decodes Morse code from blinking lights in video files or webcam fee
 
 import argparse
 import sys
-from morse_decoder import MorseVideoDecoder
+import cv2
+from morse_decoder import MorseVideoDecoder, replay_trace
 from video_processor import process_video
 from webcam_processor import process_webcam
 
@@ -19,9 +20,49 @@ def main():
     parser.add_argument('--roi-size', type=int, default=64, help='ROI size in pixels')
     parser.add_argument('--interactive', action='store_true', help='Manually select ROI (recommended for webcam)')
     parser.add_argument('--no-adaptive', action='store_true', help='Disable adaptive thresholds')
+    parser.add_argument('--backend', choices=['auto', 'opencv', 'pyav', 'torchcodec'], default='auto',
+                        help='Frame decode backend for video files')
+    parser.add_argument('--resolution', default='640x480',
+                        help='Webcam capture resolution, e.g. 640x480')
+    parser.add_argument('--idle-release', action='store_true',
+                        help='Release the webcam during long silences (saves power)')
+    parser.add_argument('--opencl', action='store_true',
+                        help='Run supported OpenCV operations on an OpenCL GPU')
+    parser.add_argument('--gst', action='store_true',
+                        help='Capture through a GStreamer pipeline that drops stale frames')
+    parser.add_argument('--replay', action='store_true',
+                        help='Treat the input as a saved intensity log (.npy/.npz) and decode it directly')
+    parser.add_argument('--replay-unit', type=float, default=0.3,
+                        help='Morse unit duration in seconds for --replay')
+    parser.add_argument('--replay-threshold-high', type=float, default=0.5,
+                        help='Light-on intensity threshold for --replay')
+    parser.add_argument('--replay-threshold-low', type=float, default=0.2,
+                        help='Light-off intensity threshold for --replay')
     
     args = parser.parse_args()
     
+    if args.opencl:
+        if cv2.ocl.haveOpenCL():
+            cv2.ocl.setUseOpenCL(True)
+            print("OpenCL enabled for OpenCV operations")
+        else:
+            print("Warning: no OpenCL device available, staying on CPU")
+    
+    # Replay mode decodes a recorded intensity log - no video involved
+    if args.replay:
+        result = replay_trace(args.video,
+                              unit_duration=args.replay_unit,
+                              threshold_high=args.replay_threshold_high,
+                              threshold_low=args.replay_threshold_low)
+        if result is None:
+            # replay_trace already printed what went wrong with the file
+            sys.exit(1)
+        print("\n" + "="*50)
+        print("DECODED TEXT:")
+        print(result)
+        print("="*50)
+        return
+    
     # Handle webcam
     video_source = 0 if args.video == '0' else args.video
     is_webcam = args.video == '0'
@@ -36,9 +77,13 @@ def main():
     
     # Process video or webcam
     if is_webcam:
-        result = process_webcam(decoder, camera_id=0, display=not args.no_display)
+        width, height = (int(v) for v in args.resolution.split('x'))
+        result = process_webcam(decoder, camera_id=0, display=not args.no_display,
+                                resolution=(width, height),
+                                idle_release=args.idle_release,
+                                use_gstreamer=args.gst)
     else:
-        result = process_video(decoder, video_source, display=not args.no_display)
+        result = process_video(decoder, video_source, display=not args.no_display, backend=args.backend)
     
     print("\n" + "="*50)
     print("DECODED TEXT:")
@@ -3,21 +3,195 @@
 Webcam Processor Module - Enhanced with Calibration
 """
 import cv2
+import numpy as np
+import queue
+import sys
+import threading
 import time
 
-def calibrate_timing(decoder, cap, display=True):
-    """Calibrate by having user blink 5 dots."""
-    print("\n" + "="*50)
-    print("CALIBRATION MODE")
-    print("="*50)
-    print("Blink your flashlight ON and OFF 5 times")
-    print("(short blinks, like: blink-pause-blink-pause...)")
-    print("Press SPACE when ready...")
-    print("="*50 + "\n")
-    
-    # Wait for user
+
+class FrameGrabber:
+    """Capture thread that continuously reads the camera into a single-slot
+    mailbox, so the main loop always samples the newest frame.
+
+    Converts the pipeline from pull-oldest to pull-newest on backends that
+    ignore CAP_PROP_BUFFERSIZE, and stamps each frame with the wall-clock
+    time it was captured.
+    """
+
+    def __init__(self, cap):
+        self.cap = cap
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._frame = None
+        self._stamp = 0.0
+        self._seq = 0
+        self._taken = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.is_set():
+            ret, frame = self.cap.read()
+            if not ret:
+                self._stop.set()
+                with self._cond:
+                    self._cond.notify_all()
+                break
+
+            with self._cond:
+                self._frame = frame
+                self._stamp = time.monotonic()
+                self._seq += 1
+                self._cond.notify_all()
+
+    def latest(self, timeout=1.0):
+        """Block until a frame newer than the last returned one arrives.
+        Returns (frame, stamp), or (None, 0.0) on timeout/shutdown."""
+        with self._cond:
+            ok = self._cond.wait_for(
+                lambda: self._seq > self._taken or self._stop.is_set(), timeout)
+            if not ok or self._frame is None or self._seq <= self._taken:
+                return None, 0.0
+            self._taken = self._seq
+            return self._frame, self._stamp
+
+    def alive(self):
+        """True while the capture thread is still producing frames."""
+        return self._thread.is_alive() and not self._stop.is_set()
+
+    def stop(self):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        self._thread.join(timeout=1.0)
+
+
+def open_camera(camera_id, width=640, height=480, verbose=True,
+                use_gstreamer=False):
+    """Open a webcam with a 1-frame driver queue for low latency."""
+    if use_gstreamer:
+        # appsink with max-buffers=1 drop=true discards stale frames inside
+        # the pipeline itself - the strongest latency bound available on
+        # embedded targets (Jetson/Pi), where V4L2 buffering is the worst
+        pipeline = (
+            f"v4l2src device=/dev/video{camera_id} ! "
+            f"image/jpeg,width={width},height={height},framerate=30/1 ! "
+            "jpegdec ! videoconvert ! "
+            "appsink max-buffers=1 drop=true sync=false"
+        )
+        cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+        if cap.isOpened():
+            if verbose:
+                print(f"Camera opened via GStreamer at {width}x{height}")
+            return cap
+        print("Warning: GStreamer pipeline failed, falling back to default backend")
+
+    # Prefer V4L2 on Linux - it's the backend that honors CAP_PROP_BUFFERSIZE
+    cap = None
+    if sys.platform.startswith('linux'):
+        cap = cv2.VideoCapture(camera_id, cv2.CAP_V4L2)
+        if not cap.isOpened():
+            cap = None
+
+    if cap is None:
+        cap = cv2.VideoCapture(camera_id)
+
+    if cap.isOpened():
+        # A default 4-frame driver queue makes every read() ~3 frame periods
+        # stale, which directly distorts measured blink durations
+        if not cap.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+            print("Warning: capture backend ignored CAP_PROP_BUFFERSIZE=1")
+
+        # Decoding only needs the ROI mean, so ask for a modest resolution
+        # and MJPG: way less USB bandwidth per frame than full-res YUYV,
+        # which is where most of cap.read()'s time goes
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        cap.set(cv2.CAP_PROP_FPS, 30)
+
+        if verbose:
+            actual_w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            actual_h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            print(f"Camera opened at {actual_w}x{actual_h}")
+            if (actual_w, actual_h) != (width, height):
+                print(f"  (requested {width}x{height} - driver chose the closest mode)")
+
+    return cap
+
+
+def read_latest(cap):
+    """Read the newest webcam frame, draining any stale queued frames.
+
+    A grab() that returns almost instantly came from the driver queue, so
+    the frame it replaced was already stale; one that actually waits on
+    the sensor is the freshest available. Keeps latency bounded at ~one
+    frame period even when processing falls behind the camera.
+    """
+    while True:
+        start = time.monotonic()
+        if not cap.grab():
+            return False, None
+        if time.monotonic() - start >= 0.002:
+            # This grab waited for the sensor - it's the newest frame
+            break
+    return cap.retrieve()
+
+
+def _wait_for_light(decoder, camera_id, resolution, poll_interval=0.5,
+                    use_gstreamer=False, should_stop=None):
+    """Poll for the light at a low duty cycle with the camera released.
+
+    Opens the device just long enough to sample one frame per interval,
+    so the USB stream stays idle for most of each silence. Returns an
+    open capture once the light is back, or None on camera failure or
+    when should_stop() turns true (session shutdown)."""
+    while should_stop is None or not should_stop():
+        cap = open_camera(camera_id, *resolution, verbose=False,
+                          use_gstreamer=use_gstreamer)
+        if not cap.isOpened():
+            return None
+
+        ret, frame = read_latest(cap)
+        if not ret:
+            cap.release()
+            return None
+
+        intensity = decoder.extract_intensity(frame)
+        if intensity > decoder.threshold_high:
+            return cap  # Light is back - reuse this capture session
+
+        cap.release()
+        time.sleep(poll_interval)
+
+    return None
+
+
+def _robust_unit(durations):
+    """Median blink duration with IQR outlier rejection.
+
+    A single spurious blip (reflection, sensor noise) drags a plain mean
+    or even the median of 5 samples; quartile filtering drops outliers
+    before taking the median, all in NumPy's C core.
+    """
+    arr = np.asarray(durations, dtype=np.float64)
+    if arr.size >= 4:
+        q1, q3 = np.quantile(arr, [0.25, 0.75])
+        iqr = q3 - q1
+        kept = arr[(arr >= q1 - 1.5 * iqr) & (arr <= q3 + 1.5 * iqr)]
+        if kept.size:
+            arr = kept
+    return float(np.median(arr))
+
+
+def _wait_for_space(decoder, cap):
+    """Preview frames until the user presses SPACE (False on camera loss)."""
     while True:
-        ret, frame = cap.read()
+        ret, frame = read_latest(cap)
         if not ret:
             return False
         
@@ -25,59 +199,107 @@ def calibrate_timing(decoder, cap, display=True):
             decoder.select_roi(frame)
         
         intensity = decoder.extract_intensity(frame)
-        display_frame = decoder.draw_overlay(frame.copy(), intensity, 0)
+        # Draw in place: retrieve() returns a fresh buffer each frame
+        display_frame = decoder.draw_overlay(frame, intensity, 0)
         cv2.putText(display_frame, "Press SPACE to start calibration", 
                    (50, 200), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
         
         cv2.imshow('Morse Decoder', display_frame)
         if cv2.waitKey(1) & 0xFF == ord(' '):
-            break
-    
-    # Collect ON durations (when light is ON)
-    print("Calibrating... START BLINKING NOW!")
+            return True
+
+
+def _collect_blinks(decoder, cap, display, want_on, want_off, timeout, on_label):
+    """Measure ON/OFF durations until the targets are met or time runs out.
+
+    One loop serves both calibration flavours, so the timing fixes
+    (wall-clock stamps, monotonic deadline, flicker debounce) exist in
+    exactly one place. Returns (on_durations, off_durations).
+    """
     on_durations = []
+    off_durations = []
     
-    fps = cap.get(cv2.CAP_PROP_FPS) or 30
-    frame_count = 0
+    # Wall-clock timing: frame_count / fps drifts whenever a frame is
+    # dropped or the driver misreports FPS, which corrupts blink durations
+    t0 = time.monotonic()
     
     prev_state = False
-    on_start_time = None
-    timeout_time = time.time() + 20  # 20 second timeout
+    state_start_time = None
+    deadline = t0 + timeout  # Monotonic deadline, immune to wall-clock jumps
     
-    while len(on_durations) < 5 and time.time() < timeout_time:
-        ret, frame = cap.read()
+    while ((len(on_durations) < want_on or len(off_durations) < want_off)
+           and time.monotonic() < deadline):
+        ret, frame = read_latest(cap)
         if not ret:
             break
         
-        timestamp = frame_count / fps
+        timestamp = time.monotonic() - t0
         intensity = decoder.extract_intensity(frame)
         current_state = intensity > decoder.threshold_high  # Simple ON/OFF
         
-        # Detect ON->OFF transition (end of blink)
-        if prev_state and not current_state:
-            if on_start_time is not None:
-                duration = timestamp - on_start_time
-                if duration > 0.05:  # At least 50ms
-                    on_durations.append(duration)
-                    print(f"  Blink {len(on_durations)}: {duration*1000:.0f}ms")
-        
-        # Detect OFF->ON transition (start of blink)
-        elif not prev_state and current_state:
-            on_start_time = timestamp
-        
-        prev_state = current_state
+        # State change detected
+        if current_state != prev_state:
+            if state_start_time is None:
+                # First edge only starts the clock
+                state_start_time = timestamp
+                prev_state = current_state
+            else:
+                duration = timestamp - state_start_time
+                
+                if duration > 0.05:
+                    # Collect ON durations (dots)
+                    if prev_state:
+                        on_durations.append(duration)
+                        print(f"  {on_label} {len(on_durations)}: {duration*1000:.0f}ms")
+                    
+                    # Collect OFF durations (letter gaps)
+                    elif len(on_durations) > 0:
+                        off_durations.append(duration)
+                        print(f"    Gap: {duration*1000:.0f}ms")
+                    
+                    state_start_time = timestamp
+                    prev_state = current_state
+                    
+                    # Stop the moment the targets are met - no extra frame
+                    if len(on_durations) >= want_on and len(off_durations) >= want_off:
+                        break
+                # else: sub-50ms flicker - ignore it and keep timing the
+                # in-progress interval instead of restarting the clock
         
         if display:
-            display_frame = decoder.draw_overlay(frame.copy(), intensity, timestamp)
-            cv2.putText(display_frame, f"Blinks detected: {len(on_durations)}/5", 
+            display_frame = decoder.draw_overlay(frame, intensity, timestamp)
+            status = f"{on_label}s: {len(on_durations)}/{want_on}"
+            if want_off:
+                status += f", Gaps: {len(off_durations)}/{want_off}"
+            cv2.putText(display_frame, status, 
                        (50, 200), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
             cv2.imshow('Morse Decoder', display_frame)
-            cv2.waitKey(1)
-        
-        frame_count += 1
+            cv2.pollKey()
+    
+    return on_durations, off_durations
+
+
+def calibrate_timing(decoder, cap, display=True):
+    """Calibrate by having user blink 5 dots."""
+    print("\n" + "="*50)
+    print("CALIBRATION MODE")
+    print("="*50)
+    print("Blink your flashlight ON and OFF 5 times")
+    print("(short blinks, like: blink-pause-blink-pause...)")
+    print("Press SPACE when ready...")
+    print("="*50 + "\n")
+    
+    if not _wait_for_space(decoder, cap):
+        return False
+    
+    # Collect ON durations (when light is ON)
+    print("Calibrating... START BLINKING NOW!")
+    on_durations, _ = _collect_blinks(decoder, cap, display,
+                                      want_on=5, want_off=0, timeout=20,
+                                      on_label='Blink')
     
     if len(on_durations) >= 3:
-        avg = sum(on_durations) / len(on_durations)
+        avg = _robust_unit(on_durations)
         decoder.unit_duration = avg
         print(f"\n✓ Calibration complete!")
         print(f"  Your dot duration: {avg*1000:.0f}ms")
@@ -94,18 +316,15 @@ def calibrate_timing(decoder, cap, display=True):
         return False
 
 
-def process_webcam(decoder, camera_id=0, display=True):
+def process_webcam(decoder, camera_id=0, display=True, resolution=(640, 480),
+                   idle_release=False, use_gstreamer=False):
     """Process webcam feed and decode Morse code."""
-    cap = cv2.VideoCapture(camera_id)
-    
+    cap = open_camera(camera_id, *resolution, use_gstreamer=use_gstreamer)
+
     if not cap.isOpened():
         print(f"Error: Cannot open camera {camera_id}")
         return None
     
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    if fps == 0:
-        fps = 30
-    
     print(f"\n{'='*50}")
     print(f"WEBCAM MORSE CODE DECODER")
     print(f"{'='*50}")
@@ -121,56 +340,182 @@ def process_webcam(decoder, camera_id=0, display=True):
     print(f"{'='*50}\n")
     
     frame_count = 0
+    timestamp = 0
     decoder.state_start_time = 0
-    
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        
-        timestamp = frame_count / fps
-        
-        if decoder.roi is None:
-            decoder.select_roi(frame)
-            decoder.state_start_time = timestamp
-        
-        intensity = decoder.extract_intensity(frame)
-        new_state = decoder.detect_state(intensity)
-        
-        if new_state != decoder.current_state:
-            decoder.process_state_change(new_state, timestamp)
-        
-        # ↓↓↓ ADD THIS NEW SECTION HERE ↓↓↓
-        # Auto-decode if user pauses for too long (5 seconds)
-        if decoder.current_symbol and not decoder.current_state:
-            time_since_last_blink = timestamp - decoder.state_start_time
-            if time_since_last_blink > 5.0:  # 5 second timeout
-                char = decoder.decode_symbol()
-                if char:
-                    decoder.decoded_text += char
-                    print(f"Auto-decoded after pause: {char}")
-        # ↑↑↑ END NEW SECTION ↑↑↑
-        
-        if display:
-            display_frame = decoder.draw_overlay(frame.copy(), intensity, timestamp)
-            cv2.imshow('Morse Decoder', display_frame)
-            
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q'):
+
+    # Three-way split: FrameGrabber captures, decode_loop() below processes
+    # on its own thread, and this (main) thread only renders - imshow must
+    # run on the main thread on some platforms, and a backed-up compositor
+    # can then never stall state detection
+    grabber = FrameGrabber(cap).start()
+    t0 = time.monotonic()
+
+    display_q = queue.Queue(maxsize=1)  # Latest-wins frame handoff to the GUI
+    key_q = queue.Queue()               # Key presses back to the decode loop
+    gui_jobs = queue.Queue()            # GUI work the main thread must run
+    running = threading.Event()
+    running.set()
+
+    def run_on_gui(job):
+        """Run job on the main thread and block until it finishes.
+
+        highgui is not thread-safe (and aborts off the main thread on
+        macOS), so interactive ROI selection and recalibration are shipped
+        here instead of touching windows from the decode thread."""
+        done = threading.Event()
+        result = [None]
+
+        def wrapper():
+            try:
+                result[0] = job()
+            finally:
+                done.set()
+
+        gui_jobs.put(wrapper)
+        while not done.wait(0.1):
+            if not running.is_set():
+                return None  # Session ended before the job ran
+        return result[0]
+
+    def publish_frame(display_frame):
+        """Latest-wins put: drop the stale frame rather than ever block."""
+        try:
+            display_q.put_nowait(display_frame)
+        except queue.Full:
+            try:
+                display_q.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                display_q.put_nowait(display_frame)
+            except queue.Full:
+                pass
+
+    def decode_loop():
+        nonlocal cap, grabber, frame_count, timestamp
+
+        while running.is_set():
+            frame, stamp = grabber.latest()
+            if frame is None:
+                # A timeout is not end-of-stream: cold-starting cameras can
+                # take over a second to deliver their first frame. Only a
+                # dead grabber (read failure) ends the session.
+                if running.is_set() and grabber.alive():
+                    continue
                 break
-            elif key == ord('r'):
+
+            timestamp = stamp - t0
+
+            if decoder.roi is None:
+                # May open a selection window - must happen on the GUI thread
+                run_on_gui(lambda: decoder.select_roi(frame))
+                decoder.state_start_time = timestamp
+
+            intensity = decoder.extract_intensity(frame)
+            new_state = decoder.detect_state(intensity)
+
+            if new_state != decoder.current_state:
+                decoder.process_state_change(new_state, timestamp)
+
+            # ↓↓↓ ADD THIS NEW SECTION HERE ↓↓↓
+            # Auto-decode if user pauses for too long (5 seconds)
+            if decoder.current_symbol and not decoder.current_state:
+                time_since_last_blink = timestamp - decoder.state_start_time
+                if time_since_last_blink > 5.0:  # 5 second timeout
+                    char = decoder.decode_symbol()
+                    if char:
+                        decoder.decoded_text += char
+                        decoder.log(f"Auto-decoded after pause: {char}")
+            # ↑↑↑ END NEW SECTION ↑↑↑
+
+            # Opt-in power saver: once the auto-decode timeout has flushed
+            # the symbol, the camera holds the USB bus open for nothing.
+            # Release it and poll at a low duty cycle until the light is back.
+            if (idle_release and not decoder.current_state
+                    and timestamp - decoder.state_start_time > 5.0):
+                grabber.stop()
+                cap.release()
+                print("Idle - camera released, waiting for light...")
+                cap = _wait_for_light(decoder, camera_id, resolution,
+                                      use_gstreamer=use_gstreamer,
+                                      should_stop=lambda: not running.is_set())
+                if cap is None:
+                    break
+                grabber = FrameGrabber(cap).start()
+                decoder.state_start_time = time.monotonic() - t0
+
+            if display and frame_count % 2 == 0:
+                # Redraw every 2nd frame - detection still runs on every
+                # frame, and rendering happens on the GUI thread anyway
+                publish_frame(decoder.draw_overlay(frame, intensity, timestamp))
+
+            # Keys arrive from the GUI thread; nothing here ever blocks
+            try:
+                key = key_q.get_nowait()
+            except queue.Empty:
+                key = -1
+
+            if key == ord('r'):
                 print("\nReselecting ROI...")
                 decoder.roi = None
                 decoder.baseline = None
                 decoder.max_intensity = 0.5
             elif key == ord('c'):
                 print("\nRecalibrating...")
-                calibrate_timing(decoder, cap, display)
+                grabber.stop()  # Calibration reads the camera directly
+                run_on_gui(lambda: calibrate_timing(decoder, cap, display))
                 decoder.decoded_text = ""
                 decoder.current_symbol = []
-        
-        frame_count += 1
-    
+                decoder._symbol_code = 1
+                grabber = FrameGrabber(cap).start()
+
+            # One buffered stdout write per ~second instead of a print
+            # (and possible terminal stall) inside the frame budget
+            if frame_count % 30 == 0:
+                decoder.flush_log()
+
+            frame_count += 1
+
+        running.clear()
+
+    worker = threading.Thread(target=decode_loop, daemon=True)
+    worker.start()
+
+    try:
+        while running.is_set():
+            # GUI work requested by the decode thread (ROI selection,
+            # recalibration) runs here, on the thread that owns highgui
+            try:
+                job = gui_jobs.get_nowait()
+            except queue.Empty:
+                job = None
+            if job is not None:
+                job()
+                continue
+
+            if not display:
+                time.sleep(0.1)  # Headless: just wait for Ctrl+C or stream end
+                continue
+
+            try:
+                display_frame = display_q.get(timeout=0.05)
+                cv2.imshow('Morse Decoder', display_frame)
+            except queue.Empty:
+                pass
+
+            key = cv2.pollKey() & 0xFF
+            if key == ord('q'):
+                running.clear()
+            elif key != 255:
+                key_q.put(key)
+    except KeyboardInterrupt:
+        # Only quit path when running without a display window
+        print("\nInterrupted - finalizing...")
+        running.clear()
+
+    worker.join(timeout=2.0)
+    decoder.flush_log()
+
     # ↓↓↓ ALSO IMPROVE THIS FINALIZATION SECTION ↓↓↓
     # Finalize - force decode any remaining symbol
     if decoder.current_state:
@@ -185,12 +530,18 @@ def process_webcam(decoder, camera_id=0, display=True):
             print(f"\nFinal character decoded: {char}")
     
     print(f"\nFinal decoded text: '{decoder.decoded_text}'")
+    # Measured rate, not the driver-reported one - USB webcams often lie
+    print(f"Measured capture rate: {frame_count / (timestamp + 1e-6):.1f} FPS")
     # ↑↑↑ END IMPROVED FINALIZATION ↑↑↑
-    
-    cap.release()
+
+    grabber.stop()
+    if cap is not None:  # The camera may have died during an idle reopen
+        cap.release()
     cv2.destroyAllWindows()
     
     return decoder.decoded_text
+
+
 def calibrate_with_pattern(decoder, cap, display=True):
     """Calibrate by having user send 'EEEEE' (5 dots)."""
     print("\n" + "="*50)
@@ -205,84 +556,24 @@ def calibrate_with_pattern(decoder, cap, display=True):
     print("Press SPACE when ready...")
     print("="*50 + "\n")
     
-    # Wait for user
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            return False
-        
-        if decoder.roi is None:
-            decoder.select_roi(frame)
-        
-        intensity = decoder.extract_intensity(frame)
-        display_frame = decoder.draw_overlay(frame.copy(), intensity, 0)
-        cv2.putText(display_frame, "Press SPACE to start calibration", 
-                   (50, 200), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 255), 2)
-        
-        cv2.imshow('Morse Decoder', display_frame)
-        if cv2.waitKey(1) & 0xFF == ord(' '):
-            break
+    if not _wait_for_space(decoder, cap):
+        return False
     
     print("Calibrating... Send 'EEEEE' now!")
     print("(5 short blinks with pauses between)")
     
-    on_durations = []
-    off_durations = []
-    
-    fps = cap.get(cv2.CAP_PROP_FPS) or 30
-    frame_count = 0
-    
-    prev_state = False
-    state_start_time = None
-    timeout_time = time.time() + 25
-    
-    while (len(on_durations) < 5 or len(off_durations) < 4) and time.time() < timeout_time:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        
-        timestamp = frame_count / fps
-        intensity = decoder.extract_intensity(frame)
-        current_state = intensity > decoder.threshold_high
-        
-        # State change detected
-        if current_state != prev_state:
-            if state_start_time is not None:
-                duration = timestamp - state_start_time
-                
-                # Collect ON durations (dots)
-                if prev_state and duration > 0.05:
-                    on_durations.append(duration)
-                    print(f"  Dot {len(on_durations)}: {duration*1000:.0f}ms")
-                
-                # Collect OFF durations (letter gaps)
-                elif not prev_state and duration > 0.05 and len(on_durations) > 0:
-                    off_durations.append(duration)
-                    print(f"    Gap: {duration*1000:.0f}ms")
-            
-            state_start_time = timestamp
-            prev_state = current_state
-        
-        if display:
-            display_frame = decoder.draw_overlay(frame.copy(), intensity, timestamp)
-            status = f"Dots: {len(on_durations)}/5, Gaps: {len(off_durations)}/4"
-            cv2.putText(display_frame, status, 
-                       (50, 200), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
-            cv2.imshow('Morse Decoder', display_frame)
-            cv2.waitKey(1)
-        
-        frame_count += 1
+    on_durations, off_durations = _collect_blinks(decoder, cap, display,
+                                                  want_on=5, want_off=4,
+                                                  timeout=25, on_label='Dot')
     
     # Calculate unit from dots
     if len(on_durations) >= 3:
-        import statistics
-        
-        # Use median of ON durations as unit (dots should be ~1 unit)
-        median_dot = statistics.median(on_durations)
+        # Use outlier-filtered median of ON durations as unit (dots ~1 unit)
+        median_dot = _robust_unit(on_durations)
         
         # Validate by checking letter gaps (should be ~3x dot)
         if len(off_durations) >= 2:
-            median_gap = statistics.median(off_durations)
+            median_gap = _robust_unit(off_durations)
             ratio = median_gap / median_dot
             print(f"\n  Analysis:")
             print(f"    Median dot: {median_dot*1000:.0f}ms")